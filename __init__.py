@@ -4,8 +4,9 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import Mapping
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import logging
+import sys
 from typing import Any
 
 import voluptuous as vol
@@ -21,12 +22,19 @@ from homeassistant.const import (
     EVENT_HOMEASSISTANT_STOP,
     Platform,
 )
-from homeassistant.core import Event, HomeAssistant, ServiceCall, callback
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    callback,
+)
 from homeassistant.exceptions import ConfigEntryNotReady, ServiceValidationError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.dispatcher import async_dispatcher_connect, dispatcher_send
 from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.util import slugify
 
@@ -54,6 +62,8 @@ DEFAULT_FADE_RATE = 1.0
 
 KEYPAD_LEDSTATE_POLL_COOLDOWN = 1.0
 
+DISCOVERY_STORAGE_VERSION = 1
+
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 SERVICE_SEND_COMMAND_SCHEMA = vol.Schema(
@@ -72,6 +82,8 @@ class HomeworksData:
     controller_id: str
     keypads: dict[str, HomeworksKeypad]
     switches: dict[str, HomeworksSwitch]
+    # Held by device discovery, one run per controller at a time
+    discovery_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
 
 
 @callback
@@ -143,6 +155,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.data.setdefault(DOMAIN, {})
     controller_id = entry.options[CONF_CONTROLLER_ID]
+    signals: dict[tuple[str, str], str] = {}
 
     def hw_callback(msg_type: Any, values: Any) -> None:
         """Dispatch state changes."""
@@ -150,8 +163,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if msg_type == HW_LOGIN_INCORRECT:
             _LOGGER.debug("login incorrect")
             return
-        addr = values[0]
-        signal = f"homeworks_entity_{controller_id}_{addr}"
+        key = (values[0], msg_type)
+        if (signal := signals.get(key)) is None:
+            signal = signals[key] = entity_signal(controller_id, *key)
         dispatcher_send(hass, signal, msg_type, values)
 
     config = entry.options
@@ -213,6 +227,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the discovery cache of a deleted config entry."""
+    await discovery_store(hass, entry.entry_id).async_remove()
+
+
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
     await hass.config_entries.async_reload(entry.entry_id)
@@ -223,6 +242,16 @@ def calculate_unique_id(controller_id: str, addr: str, idx: int) -> str:
     return f"homeworks.{controller_id}.{addr}.{idx}"
 
 
+def discovery_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store of devices discovered for a config entry."""
+    return Store(hass, DISCOVERY_STORAGE_VERSION, f"{DOMAIN}.discovery.{entry_id}")
+
+
+def entity_signal(controller_id: str, addr: str, msg_type: str) -> str:
+    """Return the dispatcher signal for messages of a type from an address."""
+    return sys.intern(f"homeworks_entity_{controller_id}_{addr}_{msg_type}")
+
+
 class HomeworksEntity(Entity):
     """Base class of a Homeworks device."""
 
@@ -277,11 +306,18 @@ class HomeworksKeypad:
         self._hass = hass
         self._name = name
         self._id = slugify(self._name)
-        signal = f"homeworks_entity_{controller_id}_{self._addr}"
-        _LOGGER.debug("connecting %s", signal)
-        self.unsubscribe = async_dispatcher_connect(
-            self._hass, signal, self._update_callback
-        )
+        self._unsubscribers: list[CALLBACK_TYPE] = []
+        for msg_type in (HW_BUTTON_PRESSED, HW_BUTTON_RELEASED):
+            signal = entity_signal(controller_id, self._addr, msg_type)
+            _LOGGER.debug("connecting %s", signal)
+            self._unsubscribers.append(
+                async_dispatcher_connect(self._hass, signal, self._update_callback)
+            )
+
+    def unsubscribe(self) -> None:
+        """Disconnect from the dispatcher."""
+        for unsubscribe in self._unsubscribers:
+            unsubscribe()
 
     @callback
     def _update_callback(self, msg_type: str, values: list[Any]) -> None:
@@ -325,11 +361,18 @@ class HomeworksSwitch:
         self._hass = hass
         self._name = name
         self._id = slugify(self._name)
-        signal = f"homeworks_entity_{controller_id}_{self._addr}"
-        _LOGGER.debug("connecting %s", signal)
-        self.unsubscribe = async_dispatcher_connect(
-            self._hass, signal, self._update_callback
-        )
+        self._unsubscribers: list[CALLBACK_TYPE] = []
+        for msg_type in (HW_CCO_CHANGED, HW_CCI_CHANGED):
+            signal = entity_signal(controller_id, self._addr, msg_type)
+            _LOGGER.debug("connecting %s", signal)
+            self._unsubscribers.append(
+                async_dispatcher_connect(self._hass, signal, self._update_callback)
+            )
+
+    def unsubscribe(self) -> None:
+        """Disconnect from the dispatcher."""
+        for unsubscribe in self._unsubscribers:
+            unsubscribe()
 
     @callback
     def _update_callback(self, msg_type: str, values: list[Any]) -> None:
@@ -13,7 +13,7 @@ from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import HomeworksData, HomeworksEntity, HomeworksKeypad
+from . import HomeworksData, HomeworksEntity, HomeworksKeypad, entity_signal
 from .const import (
     CONF_ADDR,
     CONF_BUTTONS,
@@ -77,7 +77,9 @@ class HomeworksBinarySensor(HomeworksEntity, BinarySensorEntity):
 
     async def async_added_to_hass(self) -> None:
         """Call when entity is added to hass."""
-        signal = f"homeworks_entity_{self._controller_id}_{self._addr}"
+        signal = entity_signal(
+            self._controller_id, self._addr, HW_KEYPAD_LED_CHANGED
+        )
         _LOGGER.debug("connecting %s", signal)
         self.async_on_remove(
             async_dispatcher_connect(self.hass, signal, self._update_callback)
@@ -87,7 +89,7 @@ class HomeworksBinarySensor(HomeworksEntity, BinarySensorEntity):
     @callback
     def _update_callback(self, msg_type: str, values: list[Any]) -> None:
         """Process device specific messages."""
-        if msg_type != HW_KEYPAD_LED_CHANGED or len(values[1]) < self._idx:
+        if len(values[1]) < self._idx:
             return
         self._attr_is_on = bool(values[1][self._idx - 1])
         self.async_write_ha_state()
@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
-from functools import partial
+import asyncio
+from contextlib import closing
 import logging
+from math import prod
+import re
+import socket
+import time
 from typing import Any
 
 import voluptuous as vol
@@ -21,7 +26,7 @@ from homeassistant.const import (
     CONF_PORT,
     CONF_USERNAME,
 )
-from homeassistant.core import async_get_hass, callback
+from homeassistant.core import HomeAssistant, async_get_hass, callback
 from homeassistant.data_entry_flow import AbortFlow
 from homeassistant.helpers import (
     config_validation as cv,
@@ -39,7 +44,7 @@ from homeassistant.helpers.selector import TextSelector
 from homeassistant.helpers.typing import VolDictType
 from homeassistant.util import slugify
 
-from . import DEFAULT_FADE_RATE, calculate_unique_id
+from . import DEFAULT_FADE_RATE, HomeworksData, calculate_unique_id, discovery_store
 from .const import (
     CONF_ADDR,
     CONF_BUTTONS,
@@ -62,7 +67,12 @@ from .const import (
 )
 from .pyhomeworks import exceptions as hw_exceptions
 from .pyhomeworks.pyhomeworks import Homeworks
-from .pyhomeworks.discovery import HomeworksDiscovery, DiscoveredDevice
+from .pyhomeworks.discovery import (
+    DISCOVERY_BATCH_SIZE,
+    PROBE_TIMEOUT,
+    DiscoveredDevice,
+    HomeworksDiscovery,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -113,7 +123,31 @@ DATA_SCHEMA_ADD_SWITCH = vol.Schema(
     }
 )
 
-validate_addr = cv.matches_regex(r"\[(?:\d\d:){0,2}\d\d:\d\d:\d\d\]")
+# Seconds to wait for the controller when testing a connection
+CONNECTION_TEST_TIMEOUT = 5
+
+# Seconds an auto-discovery run may take before it is stopped, keeping the
+# devices found so far
+DISCOVERY_TIMEOUT = 300
+# Largest number of addresses a single auto-discovery run may cover: as
+# many batches as fit in 80% of DISCOVERY_TIMEOUT if none of them answers
+DISCOVERY_MAX_ADDRESSES = (
+    int(DISCOVERY_TIMEOUT * 0.8 / PROBE_TIMEOUT) * DISCOVERY_BATCH_SIZE
+)
+DISCOVERY_PLACEHOLDERS = {"max_addresses": str(DISCOVERY_MAX_ADDRESSES)}
+
+# Discovered devices are remembered per config entry and probed again once
+# their entry is older than the TTL (seconds)
+DISCOVERY_CACHE_TTL = 86400
+
+_ADDR_RE = re.compile(r"\[(?:\d\d:){0,2}\d\d:\d\d:\d\d\]")
+
+
+def validate_addr(addr: Any) -> str:
+    """Validate a Homeworks address formatted as `[##:##:##:##]`."""
+    if not isinstance(addr, str) or not _ADDR_RE.fullmatch(addr):
+        raise vol.Invalid("invalid_addr")
+    return addr
 
 
 async def validate_add_controller(
@@ -160,15 +194,31 @@ async def _try_connection(user_input: dict[str, Any]) -> None:
         _LOGGER.debug(
             "Trying to connect to %s:%s", user_input[CONF_HOST], user_input[CONF_PORT]
         )
-        controller = Homeworks(host, port, lambda msg_types, values: None, login_secret)
-        controller.connect()
-        controller.close()
+        controller = Homeworks(
+            host,
+            port,
+            lambda msg_types, values: None,
+            login_secret,
+            timeout=CONNECTION_TEST_TIMEOUT,
+        )
+        with closing(controller):
+            controller.connect()
 
+    # Resolve the host first, so that a name which does not resolve fails
+    # within CONNECTION_TEST_TIMEOUT. The schemas already bound the port.
+    host: str = user_input[CONF_HOST]
+    port: int = user_input[CONF_PORT]
     hass = async_get_hass()
     try:
-        await hass.async_add_executor_job(
-            _try_connect, user_input[CONF_HOST], user_input[CONF_PORT]
-        )
+        async with asyncio.timeout(CONNECTION_TEST_TIMEOUT):
+            await hass.loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    # ValueError covers the UnicodeError raised for hosts IDNA can't encode
+    except (OSError, TimeoutError, ValueError) as err:
+        _LOGGER.debug("Failed to resolve %s:%s", host, port, exc_info=True)
+        raise SchemaFlowError("connection_error") from err
+
+    try:
+        await hass.async_add_executor_job(_try_connect, host, port)
     except hw_exceptions.HomeworksConnectionFailed as err:
         _LOGGER.debug("Caught HomeworksConnectionFailed")
         raise SchemaFlowError("connection_error") from err
@@ -190,36 +240,58 @@ def _validate_address(handler: SchemaCommonFlowHandler, addr: str) -> None:
     except vol.Invalid as err:
         raise SchemaFlowError("invalid_addr") from err
 
-    for _key in (CONF_DIMMERS, CONF_KEYPADS):
-        items: list[dict[str, Any]] = handler.options[_key]
+    if addr in _get_addr_index(handler):
+        raise SchemaFlowError("duplicated_addr")
+
 
-        for item in items:
-            if item[CONF_ADDR] == addr:
-                raise SchemaFlowError("duplicated_addr")
+def _get_addr_index(handler: SchemaCommonFlowHandler) -> set[str]:
+    """Return the set of light and keypad addresses, cached in flow state."""
+    if (addr_index := handler.flow_state.get("_addr_index")) is None:
+        addr_index = handler.flow_state["_addr_index"] = {
+            item[CONF_ADDR]
+            for key in (CONF_DIMMERS, CONF_KEYPADS)
+            for item in handler.options[key]
+        }
+    return addr_index
 
 
-def _validate_button_number(handler: SchemaCommonFlowHandler, number: int) -> None:
-    """Validate button number."""
-    keypad = handler.flow_state["_idx"]
-    buttons: list[dict[str, Any]] = handler.options[CONF_KEYPADS][keypad][CONF_BUTTONS]
+def _get_keypad_buttons(handler: SchemaCommonFlowHandler) -> list[dict[str, Any]]:
+    """Return the buttons of the keypad selected in flow state."""
+    keypads: list[dict[str, Any]] = handler.options[CONF_KEYPADS]
+    return keypads[handler.flow_state["_idx"]][CONF_BUTTONS]
+
+
+def _get_button_numbers(handler: SchemaCommonFlowHandler) -> set[int]:
+    """Return the button numbers of the selected keypad, cached in flow state."""
+    numbers_by_keypad: dict[int, set[int]] = handler.flow_state.setdefault(
+        "_button_numbers", {}
+    )
+    keypad_idx: int = handler.flow_state["_idx"]
+    if (numbers := numbers_by_keypad.get(keypad_idx)) is None:
+        numbers = numbers_by_keypad[keypad_idx] = {
+            button[CONF_NUMBER] for button in _get_keypad_buttons(handler)
+        }
+    return numbers
 
-    for button in buttons:
-        if button[CONF_NUMBER] == number:
-            raise SchemaFlowError("duplicated_number")
+
+def _validate_button_number(numbers: set[int], number: int) -> None:
+    """Validate button number."""
+    if number in numbers:
+        raise SchemaFlowError("duplicated_number")
 
 
 async def validate_add_button(
     handler: SchemaCommonFlowHandler, user_input: dict[str, Any]
 ) -> dict[str, Any]:
     """Validate button input."""
+    numbers = _get_button_numbers(handler)
     user_input[CONF_NUMBER] = int(user_input[CONF_NUMBER])
-    _validate_button_number(handler, user_input[CONF_NUMBER])
+    _validate_button_number(numbers, user_input[CONF_NUMBER])
 
     # Standard behavior is to merge the result with the options.
     # In this case, we want to add a sub-item so we update the options directly.
-    keypad = handler.flow_state["_idx"]
-    buttons: list[dict[str, Any]] = handler.options[CONF_KEYPADS][keypad][CONF_BUTTONS]
-    buttons.append(user_input)
+    _get_keypad_buttons(handler).append(user_input)
+    numbers.add(user_input[CONF_NUMBER])
     return {}
 
 
@@ -243,6 +315,7 @@ async def validate_add_keypad(
     # In this case, we want to add a sub-item so we update the options directly.
     items = handler.options[CONF_KEYPADS]
     items.append(user_input | {CONF_BUTTONS: []})
+    _get_addr_index(handler).add(user_input[CONF_ADDR])
     return {}
 
 
@@ -256,65 +329,58 @@ async def validate_add_light(
     # In this case, we want to add a sub-item so we update the options directly.
     items = handler.options[CONF_DIMMERS]
     items.append(user_input)
+    _get_addr_index(handler).add(user_input[CONF_ADDR])
     return {}
 
 
+_REQ_INDEX = vol.Required(CONF_INDEX)
+
+
+def _describe_items(items: list[dict[str, Any]], detail: str) -> dict[str, str]:
+    """Map list indexes to a "name (detail)" label for each item."""
+    return dict(
+        zip(
+            map(str, range(len(items))),
+            [f"{item[CONF_NAME]} ({item[detail]})" for item in items],
+        )
+    )
+
+
+def _index_select_schema(mapping: dict[str, str]) -> vol.Schema:
+    """Return schema for selecting a single item by index."""
+    return vol.Schema({_REQ_INDEX: vol.In(mapping)})
+
+
+def _index_multi_select_schema(mapping: dict[str, str]) -> vol.Schema:
+    """Return schema for selecting multiple items by index."""
+    return vol.Schema({_REQ_INDEX: cv.multi_select(mapping)})
+
+
 async def get_select_button_schema(handler: SchemaCommonFlowHandler) -> vol.Schema:
     """Return schema for selecting a button."""
-    keypad = handler.flow_state["_idx"]
-    buttons: list[dict[str, Any]] = handler.options[CONF_KEYPADS][keypad][CONF_BUTTONS]
+    buttons = _get_keypad_buttons(handler)
 
-    return vol.Schema(
-        {
-            vol.Required(CONF_INDEX): vol.In(
-                {
-                    str(index): f"{config[CONF_NAME]} ({config[CONF_NUMBER]})"
-                    for index, config in enumerate(buttons)
-                },
-            )
-        }
-    )
+    return _index_select_schema(_describe_items(buttons, CONF_NUMBER))
 
 
 async def get_select_keypad_schema(handler: SchemaCommonFlowHandler) -> vol.Schema:
     """Return schema for selecting a keypad."""
-    return vol.Schema(
-        {
-            vol.Required(CONF_INDEX): vol.In(
-                {
-                    str(index): f"{config[CONF_NAME]} ({config[CONF_ADDR]})"
-                    for index, config in enumerate(handler.options[CONF_KEYPADS])
-                },
-            )
-        }
+    return _index_select_schema(
+        _describe_items(handler.options[CONF_KEYPADS], CONF_ADDR)
     )
 
 
 async def get_select_light_schema(handler: SchemaCommonFlowHandler) -> vol.Schema:
     """Return schema for selecting a light."""
-    return vol.Schema(
-        {
-            vol.Required(CONF_INDEX): vol.In(
-                {
-                    str(index): f"{config[CONF_NAME]} ({config[CONF_ADDR]})"
-                    for index, config in enumerate(handler.options[CONF_DIMMERS])
-                },
-            )
-        }
+    return _index_select_schema(
+        _describe_items(handler.options[CONF_DIMMERS], CONF_ADDR)
     )
 
 
 async def get_select_switch_schema(handler: SchemaCommonFlowHandler) -> vol.Schema:
     """Return schema for selecting a switch."""
-    return vol.Schema(
-        {
-            vol.Required(CONF_INDEX): vol.In(
-                {
-                    str(index): f"{config[CONF_NAME]} ({config[CONF_ADDR]})"
-                    for index, config in enumerate(handler.options[CONF_SWITCHES])
-                },
-            )
-        }
+    return _index_select_schema(
+        _describe_items(handler.options[CONF_SWITCHES], CONF_ADDR)
     )
 
 
@@ -338,9 +404,8 @@ async def get_edit_button_suggested_values(
     handler: SchemaCommonFlowHandler,
 ) -> dict[str, Any]:
     """Return suggested values for button editing."""
-    keypad_idx: int = handler.flow_state["_idx"]
     button_idx: int = handler.flow_state["_button_idx"]
-    return dict(handler.options[CONF_KEYPADS][keypad_idx][CONF_BUTTONS][button_idx])
+    return dict(_get_keypad_buttons(handler)[button_idx])
 
 
 async def get_edit_light_suggested_values(
@@ -365,10 +430,8 @@ async def validate_button_edit(
     """Update edited keypad or light."""
     # Standard behavior is to merge the result with the options.
     # In this case, we want to add a sub-item so we update the options directly.
-    keypad_idx: int = handler.flow_state["_idx"]
     button_idx: int = handler.flow_state["_button_idx"]
-    buttons: list[dict] = handler.options[CONF_KEYPADS][keypad_idx][CONF_BUTTONS]
-    buttons[button_idx].update(user_input)
+    _get_keypad_buttons(handler)[button_idx].update(user_input)
     return {}
 
 
@@ -396,34 +459,25 @@ async def validate_switch_edit(
 
 async def get_remove_button_schema(handler: SchemaCommonFlowHandler) -> vol.Schema:
     """Return schema for button removal."""
-    keypad_idx: int = handler.flow_state["_idx"]
-    buttons: list[dict] = handler.options[CONF_KEYPADS][keypad_idx][CONF_BUTTONS]
-    return vol.Schema(
-        {
-            vol.Required(CONF_INDEX): cv.multi_select(
-                {
-                    str(index): f"{config[CONF_NAME]} ({config[CONF_NUMBER]})"
-                    for index, config in enumerate(buttons)
-                },
-            )
-        }
-    )
+    buttons = _get_keypad_buttons(handler)
+    return _index_multi_select_schema(_describe_items(buttons, CONF_NUMBER))
 
 
 async def get_remove_keypad_light_schema(
     handler: SchemaCommonFlowHandler, *, key: str
 ) -> vol.Schema:
     """Return schema for keypad or light removal."""
-    return vol.Schema(
-        {
-            vol.Required(CONF_INDEX): cv.multi_select(
-                {
-                    str(index): f"{config[CONF_NAME]} ({config[CONF_ADDR]})"
-                    for index, config in enumerate(handler.options[key])
-                },
-            )
-        }
-    )
+    return _index_multi_select_schema(_describe_items(handler.options[key], CONF_ADDR))
+
+
+async def get_remove_keypad_schema(handler: SchemaCommonFlowHandler) -> vol.Schema:
+    """Return schema for keypad removal."""
+    return await get_remove_keypad_light_schema(handler, key=CONF_KEYPADS)
+
+
+async def get_remove_light_schema(handler: SchemaCommonFlowHandler) -> vol.Schema:
+    """Return schema for light removal."""
+    return await get_remove_keypad_light_schema(handler, key=CONF_DIMMERS)
 
 
 async def get_remove_switch_schema(
@@ -431,16 +485,20 @@ async def get_remove_switch_schema(
 ) -> vol.Schema:
     """Return schema for switch removal."""
     switches: list[dict] = handler.options[CONF_SWITCHES]
-    return vol.Schema(
-        {
-            vol.Required(CONF_INDEX): cv.multi_select(
-                {
-                    str(index): f"{config[CONF_NAME]} ({config[CONF_ADDR]})"
-                    for index, config in enumerate(switches)
-                },
-            )
-        }
-    )
+    return _index_multi_select_schema(_describe_items(switches, CONF_ADDR))
+
+
+def _get_entity_index(
+    handler: SchemaCommonFlowHandler, entity_registry: er.EntityRegistry
+) -> dict[tuple[str, str], str]:
+    """Return entity ids of the config entry keyed by domain and unique id."""
+    return {
+        (entry.domain, entry.unique_id): entry.entity_id
+        for entry in er.async_entries_for_config_entry(
+            entity_registry, handler.parent_handler.config_entry.entry_id
+        )
+        if entry.platform == DOMAIN
+    }
 
 
 async def validate_remove_button(
@@ -452,26 +510,25 @@ async def validate_remove_button(
     # Standard behavior is to merge the result with the options.
     # In this case, we want to remove sub-items so we update the options directly.
     entity_registry = er.async_get(handler.parent_handler.hass)
+    by_uid = _get_entity_index(handler, entity_registry)
+    controller_id: str = handler.options[CONF_CONTROLLER_ID]
     keypad_idx: int = handler.flow_state["_idx"]
     keypad: dict = handler.options[CONF_KEYPADS][keypad_idx]
-    items: list[dict[str, Any]] = []
-    item: dict[str, Any]
-    for index, item in enumerate(keypad[CONF_BUTTONS]):
-        if str(index) not in removed_indexes:
-            items.append(item)
-        button_number = keypad[CONF_BUTTONS][index][CONF_NUMBER]
+    numbers = _get_button_numbers(handler)
+    items: list[dict[str, Any]] = keypad[CONF_BUTTONS]
+    keypad[CONF_BUTTONS] = [
+        item for index, item in enumerate(items) if str(index) not in removed_indexes
+    ]
+    to_remove: list[str] = []
+    for index in removed_indexes:
+        button_number = items[int(index)][CONF_NUMBER]
+        numbers.discard(button_number)
+        unique_id = calculate_unique_id(controller_id, keypad[CONF_ADDR], button_number)
         for domain in (BINARY_SENSOR_DOMAIN, BUTTON_DOMAIN):
-            if entity_id := entity_registry.async_get_entity_id(
-                domain,
-                DOMAIN,
-                calculate_unique_id(
-                    handler.options[CONF_CONTROLLER_ID],
-                    keypad[CONF_ADDR],
-                    button_number,
-                ),
-            ):
-                entity_registry.async_remove(entity_id)
-    keypad[CONF_BUTTONS] = items
+            if entity_id := by_uid.get((domain, unique_id)):
+                to_remove.append(entity_id)
+    for entity_id in to_remove:
+        entity_registry.async_remove(entity_id)
     return {}
 
 
@@ -484,20 +541,26 @@ async def validate_remove_switch(
     # Standard behavior is to merge the result with the options.
     # In this case, we want to remove sub-items so we update the options directly.
     entity_registry = er.async_get(handler.parent_handler.hass)
-    items: list[dict[str, Any]] = []
-    item: dict[str, Any]
-    for index, item in enumerate(handler.options[CONF_SWITCHES]):
-        if str(index) not in removed_indexes:
-            items.append(item)
-        if entity_id := entity_registry.async_get_entity_id(
-            SWITCH_DOMAIN,
-            DOMAIN,
-            calculate_unique_id(
-                handler.options[CONF_CONTROLLER_ID], item[CONF_ADDR], 0
-            ),
-        ):
-            entity_registry.async_remove(entity_id)
-    handler.options[CONF_SWITCHES] = items
+    by_uid = _get_entity_index(handler, entity_registry)
+    controller_id: str = handler.options[CONF_CONTROLLER_ID]
+    items: list[dict[str, Any]] = handler.options[CONF_SWITCHES]
+    handler.options[CONF_SWITCHES] = [
+        item for index, item in enumerate(items) if str(index) not in removed_indexes
+    ]
+    to_remove: list[str] = [
+        entity_id
+        for index in removed_indexes
+        if (
+            entity_id := by_uid.get(
+                (
+                    SWITCH_DOMAIN,
+                    calculate_unique_id(controller_id, items[int(index)][CONF_ADDR], 0),
+                )
+            )
+        )
+    ]
+    for entity_id in to_remove:
+        entity_registry.async_remove(entity_id)
     return {}
 
 
@@ -510,52 +573,164 @@ async def validate_remove_keypad_light(
     # Standard behavior is to merge the result with the options.
     # In this case, we want to remove sub-items so we update the options directly.
     entity_registry = er.async_get(handler.parent_handler.hass)
-    items: list[dict[str, Any]] = []
-    item: dict[str, Any]
-    for index, item in enumerate(handler.options[key]):
-        if str(index) not in removed_indexes:
-            items.append(item)
-        elif key != CONF_DIMMERS:
-            continue
-        if entity_id := entity_registry.async_get_entity_id(
-            LIGHT_DOMAIN,
-            DOMAIN,
-            calculate_unique_id(
-                handler.options[CONF_CONTROLLER_ID], item[CONF_ADDR], 0
-            ),
-        ):
-            entity_registry.async_remove(entity_id)
-    handler.options[key] = items
+    by_uid = _get_entity_index(handler, entity_registry)
+    controller_id: str = handler.options[CONF_CONTROLLER_ID]
+    items: list[dict[str, Any]] = handler.options[key]
+    handler.options[key] = [
+        item for index, item in enumerate(items) if str(index) not in removed_indexes
+    ]
+    to_remove: list[str] = []
+    if key == CONF_DIMMERS:
+        to_remove = [
+            entity_id
+            for index in removed_indexes
+            if (
+                entity_id := by_uid.get(
+                    (
+                        LIGHT_DOMAIN,
+                        calculate_unique_id(
+                            controller_id, items[int(index)][CONF_ADDR], 0
+                        ),
+                    )
+                )
+            )
+        ]
+    for entity_id in to_remove:
+        entity_registry.async_remove(entity_id)
+    handler.flow_state.pop("_addr_index", None)
+    # Keypad indexes may have shifted
+    handler.flow_state.pop("_button_numbers", None)
     return {}
 
 
+async def validate_remove_keypad(
+    handler: SchemaCommonFlowHandler, user_input: dict[str, Any]
+) -> dict[str, Any]:
+    """Validate remove keypad."""
+    return await validate_remove_keypad_light(handler, user_input, key=CONF_KEYPADS)
+
+
+async def validate_remove_light(
+    handler: SchemaCommonFlowHandler, user_input: dict[str, Any]
+) -> dict[str, Any]:
+    """Validate remove light."""
+    return await validate_remove_keypad_light(handler, user_input, key=CONF_DIMMERS)
+
+
 async def async_step_auto_discover(
     handler: SchemaCommonFlowHandler, user_input: dict[str, Any]
 ) -> dict[str, Any]:
     """Handle auto-discovery step."""
     if not user_input:
         return {}
-    
+
+    _validate_discovery_range(user_input)
+    return user_input
+
+
+async def get_auto_discover_placeholders(
+    handler: SchemaCommonFlowHandler,
+) -> dict[str, str]:
+    """Return the placeholders of the auto-discovery form."""
+    return DISCOVERY_PLACEHOLDERS
+
+
+def _validate_discovery_range(user_input: dict[str, Any]) -> None:
+    """Validate the address range to discover."""
     try:
-        validate_addr(user_input["start_addr"])
-        validate_addr(user_input["end_addr"])
+        for key in ("start_addr", "end_addr"):
+            validate_addr(user_input[key])
     except vol.Invalid as err:
         raise SchemaFlowError("invalid_addr") from err
-        
-    return user_input
+
+    # Every address part is scanned from its start to its end value
+    start = user_input["start_addr"][1:-1].split(":")
+    end = user_input["end_addr"][1:-1].split(":")
+    if len(start) != len(end) or any(low > high for low, high in zip(start, end)):
+        raise SchemaFlowError("invalid_addr_range")
+    if (
+        prod(int(high) - int(low) + 1 for low, high in zip(start, end))
+        > DISCOVERY_MAX_ADDRESSES
+    ):
+        raise SchemaFlowError("discovery_range_too_large")
+
+
+async def _async_discover_devices(
+    hass: HomeAssistant,
+    data: HomeworksData,
+    entry_id: str,
+    start_addr: str,
+    end_addr: str,
+) -> dict[str, DiscoveredDevice]:
+    """Discover devices, skipping addresses with a recent cached result.
+
+    Runs on the same controller are serialized, so they neither interleave
+    probes on its connection nor race on the cache.
+    """
+    async with data.discovery_lock:
+        return await _async_discover_devices_locked(
+            hass, data.controller, entry_id, start_addr, end_addr
+        )
+
+
+async def _async_discover_devices_locked(
+    hass: HomeAssistant,
+    controller: Homeworks,
+    entry_id: str,
+    start_addr: str,
+    end_addr: str,
+) -> dict[str, DiscoveredDevice]:
+    """Discover devices, with the controller's discovery lock held."""
+    store = discovery_store(hass, entry_id)
+    now = time.time()
+    cached: dict[str, dict[str, Any]] = {
+        addr: entry
+        for addr, entry in ((await store.async_load()) or {}).items()
+        if now - entry["seen"] < DISCOVERY_CACHE_TTL
+    }
+    known = {
+        addr: DiscoveredDevice(addr, entry["device_type"], entry["name"])
+        for addr, entry in cached.items()
+    }
+
+    discovery = HomeworksDiscovery(controller)
+
+    @callback
+    def _async_stop() -> None:
+        _LOGGER.warning(
+            "Device discovery stopped after %s seconds, keeping the devices "
+            "found so far",
+            DISCOVERY_TIMEOUT,
+        )
+        discovery.stop_discovery()
+
+    stop = hass.loop.call_later(DISCOVERY_TIMEOUT, _async_stop)
+    try:
+        discovered = await discovery.discover_devices(
+            start_addr=start_addr, end_addr=end_addr, known=known
+        )
+    finally:
+        stop.cancel()
+        # Also remember what a cancelled run found before it was cancelled
+        for addr, device in discovery.discovered_devices.items():
+            if addr not in known:
+                cached[addr] = {
+                    "device_type": device.device_type,
+                    "name": device.name,
+                    "seen": now,
+                }
+        store.async_delay_save(lambda: cached)
+    return discovered
+
 
 async def get_select_discovered_schema(
     handler: SchemaCommonFlowHandler
 ) -> vol.Schema:
     """Get schema for discovered devices selection."""
-    return vol.Schema(
+    return _index_multi_select_schema(
         {
-            vol.Required(CONF_INDEX): cv.multi_select(
-                {
-                    str(index): f"{device.name} ({device.addr})"
-                    for index, device in enumerate(handler.flow_state.get("discovered_devices", []))
-                }
-            )
+            str(index): f"{device.name} ({device.addr})"
+            for index, device in enumerate(handler.flow_state.get("discovered_devices", []))
         }
     )
 
@@ -604,6 +779,12 @@ DATA_SCHEMA_ADD_BUTTON = vol.Schema(
 DATA_SCHEMA_EDIT_BUTTON = vol.Schema(BUTTON_EDIT)
 DATA_SCHEMA_EDIT_LIGHT = vol.Schema(LIGHT_EDIT)
 DATA_SCHEMA_EDIT_SWITCH = vol.Schema(BUTTON_EDIT)
+DATA_SCHEMA_AUTO_DISCOVER = vol.Schema(
+    {
+        vol.Optional("start_addr", default="[01:01:00:01]"): str,
+        vol.Optional("end_addr", default="[01:01:63:99]"): str,
+    }
+)
 
 OPTIONS_FLOW = {
     "init": SchemaFlowMenuStep(
@@ -661,9 +842,9 @@ OPTIONS_FLOW = {
         validate_user_input=validate_remove_button,
     ),
     "remove_keypad": SchemaFlowFormStep(
-        partial(get_remove_keypad_light_schema, key=CONF_KEYPADS),
+        get_remove_keypad_schema,
         suggested_values=None,
-        validate_user_input=partial(validate_remove_keypad_light, key=CONF_KEYPADS),
+        validate_user_input=validate_remove_keypad,
     ),
     "add_switch": SchemaFlowFormStep(
         DATA_SCHEMA_ADD_SWITCH,
@@ -682,9 +863,9 @@ OPTIONS_FLOW = {
         validate_user_input=validate_switch_edit,
     ),
     "remove_switch": SchemaFlowFormStep(
-        partial(get_remove_keypad_light_schema, key=CONF_SWITCHES),
+        get_remove_switch_schema,
         suggested_values=None,
-        validate_user_input=partial(validate_remove_keypad_light, key=CONF_SWITCHES),
+        validate_user_input=validate_remove_switch,
     ),
     "add_light": SchemaFlowFormStep(
         DATA_SCHEMA_ADD_LIGHT,
@@ -703,17 +884,15 @@ OPTIONS_FLOW = {
         validate_user_input=validate_light_edit,
     ),
     "remove_light": SchemaFlowFormStep(
-        partial(get_remove_keypad_light_schema, key=CONF_DIMMERS),
+        get_remove_light_schema,
         suggested_values=None,
-        validate_user_input=partial(validate_remove_keypad_light, key=CONF_DIMMERS),
+        validate_user_input=validate_remove_light,
     ),
     "auto_discover": SchemaFlowFormStep(
-        {
-            vol.Optional("start_addr", default="[00:00:00:00]"): str,
-            vol.Optional("end_addr", default="[99:99:99:99]"): str,
-        },
+        DATA_SCHEMA_AUTO_DISCOVER,
         suggested_values=None,
         validate_user_input=async_step_auto_discover,
+        description_placeholders=get_auto_discover_placeholders,
     ),
     "select_discovered": SchemaFlowFormStep(
         get_select_discovered_schema,
@@ -821,21 +1000,44 @@ class HomeworksConfigFlowHandler(ConfigFlow, domain=DOMAIN):
         if user_input is None:
             return self.async_show_form(
                 step_id="auto_discover",
-                data_schema=vol.Schema({
-                    vol.Optional("start_addr", default="[00:00:00:00]"): str,
-                    vol.Optional("end_addr", default="[99:99:99:99]"): str,
-                }),
+                data_schema=DATA_SCHEMA_AUTO_DISCOVER,
+                description_placeholders=DISCOVERY_PLACEHOLDERS,
+            )
+
+        try:
+            _validate_discovery_range(user_input)
+        except SchemaFlowError as err:
+            return self.async_show_form(
+                step_id="auto_discover",
+                data_schema=DATA_SCHEMA_AUTO_DISCOVER,
+                errors={"base": str(err)},
+                description_placeholders=DISCOVERY_PLACEHOLDERS,
             )
 
         # Start discovery process
         data: HomeworksData = self.hass.data[DOMAIN][self.config_entry.entry_id]
-        discovery = HomeworksDiscovery(data.controller)
-        
-        discovered = await discovery.discover_devices(
-            start_addr=user_input["start_addr"],
-            end_addr=user_input["end_addr"],
+
+        discovered = await _async_discover_devices(
+            self.hass,
+            data,
+            self.config_entry.entry_id,
+            user_input["start_addr"],
+            user_input["end_addr"],
         )
 
+        # Drop duplicate reports and devices that are already configured
+        options = self.config_entry.options
+        configured = {
+            item[CONF_ADDR]
+            for key in (CONF_DIMMERS, CONF_KEYPADS, CONF_SWITCHES)
+            for item in options.get(key, [])
+        }
+        discovered = {
+            device.addr: device
+            for device in discovered.values()
+            if device.addr not in configured
+        }
+
         # Store discovered devices for the next step
         self.discovered_devices = discovered
         return await self.async_step_select_discovered()
@@ -845,40 +1047,38 @@ class HomeworksConfigFlowHandler(ConfigFlow, domain=DOMAIN):
     ) -> ConfigFlowResult:
         """Handle selection of discovered devices."""
         if user_input is None:
-            devices = []
-            for addr, device in self.discovered_devices.items():
-                devices.append({
-                    "addr": addr,
-                    "type": device.device_type,
-                    "name": device.name,
-                    "selected": device.selected
-                })
-            
             return self.async_show_form(
                 step_id="select_discovered",
-                data_schema=vol.Schema({
-                    vol.Required(f"device_{addr}"): bool
-                    for addr in self.discovered_devices
-                }),
+                data_schema=_index_multi_select_schema(
+                    {
+                        addr: f"{device.name} ({addr})"
+                        for addr, device in self.discovered_devices.items()
+                    }
+                ),
             )
 
-        # Process selected devices
-        for key, value in user_input.items():
-            if key.startswith("device_"):
-                addr = key[7:]  # Remove "device_" prefix
-                device = self.discovered_devices[addr]
-                if value:  # If device is selected
-                    if device.device_type == "light":
-                        self.options[CONF_DIMMERS].append({
-                            CONF_ADDR: addr,
-                            CONF_NAME: device.name,
-                            CONF_RATE: DEFAULT_FADE_RATE
-                        })
-                    elif device.device_type in ["cco", "cci"]:
-                        self.options[CONF_SWITCHES].append({
-                            CONF_ADDR: addr,
-                            CONF_NAME: device.name
-                        })
+        # Process selected devices. Their addresses came out of discovery and
+        # were checked against configured devices there, so no further
+        # address validation is needed.
+        selected = [self.discovered_devices[addr] for addr in user_input[CONF_INDEX]]
+        self.options[CONF_DIMMERS].extend(
+            {
+                CONF_ADDR: device.addr,
+                CONF_NAME: device.name,
+                CONF_RATE: DEFAULT_FADE_RATE,
+            }
+            for device in selected
+            if device.device_type == "light"
+        )
+        self.options[CONF_SWITCHES].extend(
+            {
+                CONF_ADDR: device.addr,
+                CONF_NAME: device.name,
+                "switch_type": device.device_type,
+            }
+            for device in selected
+            if device.device_type in (CONF_CCO, CONF_CCI)
+        )
 
         return self.async_create_entry(title="", data=self.options)
 
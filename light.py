@@ -13,7 +13,7 @@ from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import HomeworksData, HomeworksEntity
+from . import HomeworksData, HomeworksEntity, entity_signal
 from .const import CONF_ADDR, CONF_CONTROLLER_ID, CONF_DIMMERS, CONF_RATE, DOMAIN
 from .pyhomeworks.pyhomeworks import HW_LIGHT_CHANGED, Homeworks
 
@@ -65,7 +65,7 @@ class HomeworksLight(HomeworksEntity, LightEntity):
 
     async def async_added_to_hass(self) -> None:
         """Call when entity is added to hass."""
-        signal = f"homeworks_entity_{self._controller_id}_{self._addr}"
+        signal = entity_signal(self._controller_id, self._addr, HW_LIGHT_CHANGED)
         _LOGGER.debug("connecting %s", signal)
         self.async_on_remove(
             async_dispatcher_connect(self.hass, signal, self._update_callback)
@@ -104,10 +104,8 @@ class HomeworksLight(HomeworksEntity, LightEntity):
 
     @callback
     def _update_callback(self, msg_type: str, values: list[Any]) -> None:
-        """Process device specific messages."""
-
-        if msg_type == HW_LIGHT_CHANGED:
-            self._level = int((values[1] * 255.0) / 100.0)
-            if self._level != 0:
-                self._prev_level = self._level
-            self.async_write_ha_state()
+        """Process light level messages."""
+        self._level = int((values[1] * 255.0) / 100.0)
+        if self._level != 0:
+            self._prev_level = self._level
+        self.async_write_ha_state()
@@ -1,56 +1,210 @@
 """Discovery module for Homeworks devices."""
+import asyncio
 from dataclasses import dataclass
-from typing import Dict, Optional
+from itertools import islice, product
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import logging
 
-from .pyhomeworks import Homeworks
+from .pyhomeworks import (
+    HW_CCI_CHANGED,
+    HW_CCO_CHANGED,
+    HW_LIGHT_CHANGED,
+    Homeworks,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
-@dataclass
+# Number of addresses whose probes are submitted together
+DISCOVERY_BATCH_SIZE = 16
+# Seconds to wait for the controller to answer a batch of probes. The wait
+# adapts to three times the recent response time of single requests, but
+# never drops below the time the controller may need to work through a full
+# batch of queued requests.
+PROBE_TIMEOUT = 0.5
+PROBE_REQUEST_TIME = 0.005
+# Weight of the newest sample in the response time average
+RTT_SMOOTHING = 0.2
+
+# Message answering a probe, the request sending it and the device type it
+# reveals, by priority
+PROBES = (
+    (HW_LIGHT_CHANGED, Homeworks.request_dimmer_level, "light"),
+    (HW_CCO_CHANGED, Homeworks.request_cco_state, "cco"),
+    (HW_CCI_CHANGED, Homeworks.request_cci_state, "cci"),
+)
+DISCOVERY_MSG_TYPES = frozenset(msg_type for msg_type, _, _ in PROBES)
+PROBE_TIMEOUT_MIN = PROBE_REQUEST_TIME * DISCOVERY_BATCH_SIZE * len(PROBES)
+DEVICE_TYPES = {msg_type: device_type for msg_type, _, device_type in PROBES}
+DEVICE_LABELS = {"light": "Light", "cco": "CCO", "cci": "CCI"}
+
+
+@dataclass(slots=True)
 class DiscoveredDevice:
     """Represents a discovered Homeworks device."""
     addr: str
     device_type: str  # "light", "cco", "cci", "keypad"
     name: str
-    selected: bool = False
+
+
+def _parse_address(addr: str) -> List[int]:
+    """Split a `[##:##:##:##]` address into its numeric segments."""
+    return [int(segment) for segment in addr.strip("[]").split(":")]
+
+
+def _generate_addresses(start_addr: str, end_addr: str) -> Iterator[str]:
+    """Yield every address between start_addr and end_addr, segment by segment."""
+    start = _parse_address(start_addr)
+    end = _parse_address(end_addr)
+    if len(start) != len(end):
+        raise ValueError(f"Address format mismatch: {start_addr} / {end_addr}")
+    ranges = [range(low, high + 1) for low, high in zip(start, end)]
+    fmt = ("[" + ":".join(["{:02d}"] * len(start)) + "]").format
+    for segments in product(*ranges):
+        yield fmt(*segments)
+
 
 class HomeworksDiscovery:
     """Class to handle device discovery."""
-    
+
     def __init__(self, controller: Homeworks):
         """Initialize the discovery class."""
         self._controller = controller
         self._discovered_devices: Dict[str, DiscoveredDevice] = {}
+        self._waiters: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_discovery = False
+        self._discovery_lock = asyncio.Lock()
+        # Start out assuming a slow bus, i.e. waiting the full PROBE_TIMEOUT
+        self._rtt = PROBE_TIMEOUT / 3
+        # Send time of each probe of the running discovery
+        self._sent_ts: Dict[Tuple[str, str], float] = {}
 
     async def discover_devices(
-        self, 
-        start_addr: str = "[00:00:00:00]", 
-        end_addr: str = "[99:99:99:99]"
+        self,
+        start_addr: str = "[00:00:00:00]",
+        end_addr: str = "[99:99:99:99]",
+        known: Optional[Dict[str, DiscoveredDevice]] = None,
     ) -> Dict[str, DiscoveredDevice]:
-        """Discover devices in the specified address range."""
-        _LOGGER.debug("Starting device discovery from %s to %s", start_addr, end_addr)
-        
-        # Clear previous discoveries
-        self._discovered_devices.clear()
-        
-        # Request device information for each address in range
-        # This is a simplified version - in reality you'd need to parse the address format
-        # and iterate through valid addresses
-        
-        # For demonstration, just add some test devices
-        self._discovered_devices["[01:01:01:01]"] = DiscoveredDevice(
-            addr="[01:01:01:01]",
-            device_type="light",
-            name="Discovered Light 1"
-        )
-        
-        self._discovered_devices["[01:01:01:02]"] = DiscoveredDevice(
-            addr="[01:01:01:02]",
-            device_type="cco",
-            name="Discovered CCO 1"
+        """Discover devices in the specified address range.
+
+        Devices in known, e.g. from an earlier run, are reported without
+        probing their address again.
+        """
+        async with self._discovery_lock:
+            _LOGGER.debug(
+                "Starting device discovery from %s to %s", start_addr, end_addr
+            )
+
+            # Start from a fresh dict, sized for this run rather than the last one
+            self._discovered_devices = {}
+            self._loop = asyncio.get_running_loop()
+            self._stop_discovery = False
+            self._sent_ts = {}
+
+            known = known or {}
+
+            def unknown_addresses() -> Iterator[str]:
+                for addr in _generate_addresses(start_addr, end_addr):
+                    if (device := known.get(addr)) is not None:
+                        self._discovered_devices[addr] = device
+                    else:
+                        yield addr
+
+            addresses = unknown_addresses()
+
+            self._controller.register_listener(self._handle_response)
+            try:
+                while not self._stop_discovery and (
+                    batch := list(islice(addresses, DISCOVERY_BATCH_SIZE))
+                ):
+                    await self._probe_batch(batch)
+            finally:
+                self._controller.unregister_listener(self._handle_response)
+                for fut in self._waiters.values():
+                    fut.cancel()
+                self._waiters.clear()
+                self._sent_ts = {}
+
+            _LOGGER.debug("Discovered %s devices", len(self._discovered_devices))
+            return self._discovered_devices
+
+    async def _probe_batch(self, addresses: List[str]) -> None:
+        """Probe a batch of addresses, waiting once for all of the answers."""
+        # Register every waiter before the first request goes out, so that no
+        # early answer is missed
+        batch: Dict[Tuple[str, str], asyncio.Future] = {}
+        for addr in addresses:
+            for msg_type, _, _ in PROBES:
+                fut = self._loop.create_future()
+                self._waiters[(addr, msg_type)] = batch[(addr, msg_type)] = fut
+        timeout = min(PROBE_TIMEOUT, max(PROBE_TIMEOUT_MIN, 3 * self._rtt))
+        try:
+            # Socket writes block, send the whole batch from the executor
+            await self._loop.run_in_executor(None, self._send_batch, addresses)
+            await asyncio.wait(batch.values(), timeout=timeout)
+        finally:
+            for key, fut in batch.items():
+                self._waiters.pop(key, None)
+                fut.cancel()
+
+        for addr in addresses:
+            for msg_type, _, device_type in PROBES:
+                if not batch[(addr, msg_type)].cancelled():
+                    self._add_device(addr, device_type)
+                    break
+
+    def _add_device(self, addr: str, device_type: str) -> None:
+        """Record a discovered device."""
+        self._discovered_devices[addr] = DiscoveredDevice(
+            addr=addr,
+            device_type=device_type,
+            name=f"{DEVICE_LABELS[device_type]} {addr}",
         )
-        
+
+    def _send_batch(self, addresses: List[str]) -> None:
+        """Send the probe requests of a batch, called from the executor."""
+        for addr in addresses:
+            for msg_type, request, _ in PROBES:
+                # Stamped before sending, the answer can't overtake it
+                self._sent_ts[(addr, msg_type)] = time.monotonic()
+                request(self._controller, addr)
+
+    def stop_discovery(self) -> None:
+        """Stop a running discovery, keeping the devices found so far.
+
+        Must be called from the event loop running the discovery.
+        """
+        self._stop_discovery = True
+        for fut in self._waiters.values():
+            fut.cancel()
+
+    def _handle_response(self, msg_type: str, values: List[Any]) -> None:
+        """Handle a controller message, called from the reader thread."""
+        # Drop unrelated traffic here instead of waking up the event loop for it
+        if msg_type not in DISCOVERY_MSG_TYPES or self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._resolve, msg_type, values)
+
+    def _resolve(self, msg_type: str, values: List[Any]) -> None:
+        """Resolve the waiter matching a controller message."""
+        addr = values[0]
+        key = (addr, msg_type)
+        if (sent_ts := self._sent_ts.pop(key, None)) is None:
+            return
+        rtt = time.monotonic() - sent_ts
+        self._rtt += RTT_SMOOTHING * (rtt - self._rtt)
+        fut = self._waiters.pop(key, None)
+        if fut is not None and not fut.done():
+            fut.set_result(values[1])
+        elif addr not in self._discovered_devices:
+            # The answer missed its batch's wait, keep the device anyway
+            _LOGGER.debug("Late answer from %s after %.3f s", addr, rtt)
+            self._add_device(addr, DEVICE_TYPES[msg_type])
+
+    @property
+    def discovered_devices(self) -> Dict[str, DiscoveredDevice]:
+        """Return the devices discovered so far by the current or last run."""
         return self._discovered_devices
 
     def get_device(self, addr: str) -> Optional[DiscoveredDevice]:
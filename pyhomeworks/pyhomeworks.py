@@ -86,13 +86,15 @@ class Homeworks(Thread):
     LOGIN_PROMPT_WAIT_TIME: Final = 0.2
     SOCKET_CONNECT_TIMEOUT: Final = 10.0
 
-    def __init__(self, host, port, callback, login=None):
+    def __init__(self, host, port, callback, login=None, timeout=None):
         """Initialize."""
         Thread.__init__(self)
         self._host = host
         self._port = port
         self._login = login
+        self._timeout = self.SOCKET_CONNECT_TIMEOUT if timeout is None else timeout
         self._callback = callback
+        self._listeners = ()
         self._socket = None
 
         self._running = False
@@ -104,7 +106,7 @@ class Homeworks(Thread):
     def _connect(self, callback_on_login_error):
         """Connect to controller using host, port."""
         try:
-            self._socket = socket.create_connection((self._host, self._port), self.SOCKET_CONNECT_TIMEOUT)
+            self._socket = socket.create_connection((self._host, self._port), self._timeout)
         except (OSError, ValueError) as error:
             _LOGGER.debug("Failed to connect to %s:%s - %s", self._host, self._port, error, exc_info=True)
             raise exceptions.HomeworksConnectionFailed(f"Couldn't connect to '{self._host}:{self._port}'") from error
@@ -216,11 +218,24 @@ class Homeworks(Thread):
                 args = [parser(arg) for parser, arg in
                         zip(action[1:], raw_args[1:])]
                 self._callback(action[0], args)
+                for listener in self._listeners:
+                    listener(action[0], args)
             else:
                 _LOGGER.warning("Not handling: %s", raw_args)
         except ValueError:
             _LOGGER.warning("Unexpected data: %s", data)
 
+    def register_listener(self, listener):
+        """Register an additional callback for controller messages.
+
+        Listeners are called from the reader thread, like the main callback.
+        """
+        self._listeners = (*self._listeners, listener)
+
+    def unregister_listener(self, listener):
+        """Unregister a callback added with register_listener."""
+        self._listeners = tuple(cb for cb in self._listeners if cb is not listener)
+
     def close(self):
         """Close the connection to the controller."""
         if self._running:
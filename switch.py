@@ -8,11 +8,12 @@ from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_NAME
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import HomeworksData, HomeworksEntity
+from . import HomeworksData, HomeworksEntity, entity_signal
 from .const import (
     CONF_ADDR,
     CONF_CONTROLLER_ID,
@@ -25,6 +26,8 @@ from .pyhomeworks.pyhomeworks import HW_CCO_CHANGED, HW_CCI_CHANGED, Homeworks
 
 _LOGGER = logging.getLogger(__name__)
 
+SWITCH_STATE_POLL_COOLDOWN = 0.5
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
@@ -33,26 +36,69 @@ async def async_setup_entry(
     data: HomeworksData = hass.data[DOMAIN][entry.entry_id]
     controller = data.controller
     controller_id = entry.options[CONF_CONTROLLER_ID]
-    entities = []
-    
-    for switch in entry.options.get(CONF_SWITCHES, []):
-        entity = HomeworksSwitch(
+    state_requester = HomeworksSwitchStateRequester(hass, controller)
+    entry.async_on_unload(state_requester.shutdown)
+    switches = entry.options.get(CONF_SWITCHES, ())
+    entities = [
+        HomeworksSwitch(
             controller,
+            state_requester,
             controller_id,
             switch[CONF_ADDR],
             switch[CONF_NAME],
             switch.get("switch_type", "cco"),  # Default to CCO if not specified
         )
-        entities.append(entity)
+        for switch in switches
+    ]
     async_add_entities(entities, True)
 
 
+class HomeworksSwitchStateRequester:
+    """Query the state of switches in batches.
+
+    Debounced so that adding many switches does not storm the controller
+    with one request per entity.
+    """
+
+    def __init__(self, hass: HomeAssistant, controller: Homeworks) -> None:
+        """Initialize the requester."""
+        self._controller = controller
+        self._pending: set[tuple[str, str]] = set()
+        self._debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=SWITCH_STATE_POLL_COOLDOWN,
+            immediate=False,
+            function=self._request_states,
+        )
+
+    async def request_state(self, switch_type: str, addr: str) -> None:
+        """Queue a state request for a switch."""
+        self._pending.add((switch_type, addr))
+        await self._debouncer.async_call()
+
+    def _request_states(self) -> None:
+        """Send the queued state requests."""
+        while self._pending:
+            switch_type, addr = self._pending.pop()
+            if switch_type == CONF_CCI:
+                self._controller.request_cci_state(addr)
+            else:
+                self._controller.request_cco_state(addr)
+
+    @callback
+    def shutdown(self) -> None:
+        """Cancel pending state requests."""
+        self._debouncer.async_shutdown()
+
+
 class HomeworksSwitch(HomeworksEntity, SwitchEntity):
     """Homeworks Switch."""
 
     def __init__(
         self,
         controller: Homeworks,
+        state_requester: HomeworksSwitchStateRequester,
         controller_id: str,
         addr: str,
         name: str,
@@ -64,17 +110,22 @@ class HomeworksSwitch(HomeworksEntity, SwitchEntity):
             identifiers={(DOMAIN, f"{controller_id}.{addr}")},
             name=name,
         )
+        self._signal = entity_signal(
+            controller_id,
+            addr,
+            HW_CCI_CHANGED if switch_type == CONF_CCI else HW_CCO_CHANGED,
+        )
         self._state = False
+        self._state_requester = state_requester
         self._switch_type = switch_type
 
     async def async_added_to_hass(self) -> None:
         """Call when entity is added to Home Assistant."""
-        signal = f"homeworks_entity_{self._controller_id}_{self._addr}"
-        _LOGGER.debug("connecting %s", signal)
+        _LOGGER.debug("connecting %s", self._signal)
         self.async_on_remove(
-            async_dispatcher_connect(self.hass, signal, self._update_callback)
+            async_dispatcher_connect(self.hass, self._signal, self._update_callback)
         )
-        self._controller.request_cco_state(self._addr)
+        await self._state_requester.request_state(self._switch_type, self._addr)
 
     def turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""
@@ -91,10 +142,10 @@ class HomeworksSwitch(HomeworksEntity, SwitchEntity):
 
     @callback
     def _update_callback(self, msg_type: str, values: list[Any]) -> None:
-        """Process device specific messages."""
-        if (
-            (self._switch_type == "cco" and msg_type == HW_CCO_CHANGED) or
-            (self._switch_type == "cci" and msg_type == HW_CCI_CHANGED)
-        ):
-            self._state = values[1]
-            self.async_write_ha_state()
+        """Process state messages of the switch type."""
+        new_state = values[1]
+        # Switches repeat their state on the bus, only write actual changes
+        if new_state == self._state:
+            return
+        self._state = new_state
+        self.async_write_ha_state()